@@ -5,8 +5,8 @@ A professional Web3 M&A Deal Sourcing & Valuation Dashboard.
 """
 import streamlit as st
 import pandas as pd
-from utils.data import fetch_protocols_data, fetch_fees_data, merge_datasets
-from utils.metrics import calculate_financial_metrics, calculate_venture_score
+from utils.data import current_cache_window, is_fallback
+from utils.pipeline import fetch_all_data, load_merged_protocols, score_protocols
 from utils.ui import (
     setup_page_config, render_header, render_sidebar_filters, 
     apply_filters, render_kpi_cards, render_scatter_plot, 
@@ -21,24 +21,35 @@ def main():
     
     # Data loading
     with st.spinner("🔄 Fetching protocol data from DefiLlama..."):
-        protocols_df = fetch_protocols_data()
-        fees_df = fetch_fees_data()
-    
-    # Process data
+        cache_window = current_cache_window()
+        protocols_df, fees_df = fetch_all_data(cache_window)
+    
+    fallback = (is_fallback(protocols_df), is_fallback(fees_df))
+    if all(fallback):
+        st.warning(
+            f"⚠️ DefiLlama API is unavailable ({protocols_df.attrs['fallback']}). "
+            "Showing randomly generated sample data; retrying in a minute."
+        )
+    elif fallback[0]:
+        st.warning(f"⚠️ Failed to fetch protocol data: {protocols_df.attrs['fallback']} - we are using random generated data")
+    elif fallback[1]:
+        st.warning(f"⚠️ Failed to fetch fees data: {fees_df.attrs['fallback']}. Using sample data.")
+    
+    # Merge data and compute the sector benchmark (cached per refresh window)
+    data_token = (cache_window, fallback)
     with st.spinner("⚙️ Processing financial metrics..."):
-        merged_df = merge_datasets(protocols_df, fees_df)
-        metrics_df = calculate_financial_metrics(merged_df)
-        scored_df = calculate_venture_score(metrics_df)
+        merged_df = load_merged_protocols(cache_window, fallback, protocols_df, fees_df)
     
     # Sidebar filters
-    categories, chains, min_tvl = render_sidebar_filters(scored_df)
+    categories, chains, min_tvl = render_sidebar_filters(merged_df, data_token)
     
-    # Apply filters
-    filtered_df = apply_filters(scored_df, categories, chains, min_tvl)
+    # Apply filters (none of them depend on scores), then score only the selection
+    filtered_df = score_protocols(apply_filters(merged_df, categories, chains, min_tvl))
+    view_token = (data_token, tuple(categories), tuple(chains), min_tvl)
     
     # Status message
     st.sidebar.markdown("---")
-    st.sidebar.success(f"✅ Showing {len(filtered_df):,} of {len(scored_df):,} protocols")
+    st.sidebar.success(f"✅ Showing {len(filtered_df):,} of {len(merged_df):,} protocols")
     
     # Main content
     if len(filtered_df) == 0:
@@ -51,12 +62,12 @@ def main():
     st.markdown("---")
     
     # Scatter Plot
-    render_scatter_plot(filtered_df)
+    render_scatter_plot(filtered_df, view_token)
     
     st.markdown("---")
     
     # Additional Charts
-    render_additional_charts(filtered_df)
+    render_additional_charts(filtered_df, data_token)
     
     st.markdown("---")
     
@@ -61,6 +61,14 @@ def main():
     # Launch using `python -m streamlit run app.py` from the venv
     launch_cmd = [str(python_exe), "-m", "streamlit", "run", app_file]
     
+    if os.name != "nt":
+        # Replace this process with Streamlit instead of idling alongside it;
+        # Streamlit handles Ctrl+C itself.
+        sys.stdout.flush()
+        os.execv(str(python_exe), launch_cmd)
+    
+    # On Windows os.execv spawns a detached child rather than replacing the
+    # process, which breaks console Ctrl+C handling, so keep the subprocess.
     try:
         subprocess.call(launch_cmd)
     except KeyboardInterrupt:
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import utils.data
+from utils.data import merge_datasets, _drop_stale_downloads
+
+
+def test_merge_datasets_with_no_usable_symbol_keys():
+    # Regression: all-missing keys on both sides used to raise IndexError
+    protocols_df = pd.DataFrame({
+        'name': ['Alpha', 'Beta'],
+        'symbol': [None, None],
+        'tvl': [1.0, 2.0],
+    })
+    fees_df = pd.DataFrame({
+        'name': ['Gamma'],
+        'symbol': [None],
+        'total24h': [1.0],
+        'total7d': [7.0],
+        'total30d': [30.0],
+    })
+    
+    merged = merge_datasets(protocols_df, fees_df)
+    
+    for col in ['total24h', 'total7d', 'total30d']:
+        assert np.array_equal(merged[col].to_numpy(), [0.0, 0.0])
+
+
+def test_merge_datasets_zero_fills_integer_fee_columns():
+    # Regression: an integer result buffer turned unmatched NaN into INT64_MIN
+    protocols_df = pd.DataFrame({'name': ['a', 'b'], 'symbol': ['x', 'y'], 'tvl': [1.0, 2.0]})
+    fees_df = pd.DataFrame({
+        'name': ['a'],
+        'symbol': ['x'],
+        'total24h': [1],
+        'total7d': [2],
+        'total30d': [3],
+    })
+    
+    merged = merge_datasets(protocols_df, fees_df)
+    
+    assert merged['total24h'].tolist() == [1.0, 0.0]
+    assert merged['total7d'].tolist() == [2.0, 0.0]
+    assert merged['total30d'].tolist() == [3.0, 0.0]
+
+
+def test_merge_datasets_matches_name_then_symbol():
+    protocols_df = pd.DataFrame({
+        'name': ['Alpha', 'Beta', 'Delta'],
+        'symbol': ['ALP', 'BET', None],
+        'tvl': [1.0, 2.0, 3.0],
+    })
+    fees_df = pd.DataFrame({
+        'name': [' alpha ', 'Other'],
+        'symbol': [None, 'bet'],
+        'total24h': [1.0, 2.0],
+        'total7d': [7.0, 14.0],
+        'total30d': [30.0, 60.0],
+    })
+    
+    merged = merge_datasets(protocols_df, fees_df)
+    
+    assert merged['total24h'].tolist() == [1.0, 2.0, 0.0]
+
+
+def test_drop_stale_downloads_clears_only_on_window_change(monkeypatch):
+    monkeypatch.setattr(utils.data, '_DOWNLOAD_WINDOWS', {})
+    
+    class FakeDownload:
+        __name__ = 'fake_download'
+        clears = 0
+        
+        def clear(self):
+            self.clears += 1
+    
+    download = FakeDownload()
+    for window in [1, 1, 2, 2, 3]:
+        _drop_stale_downloads(download, window)
+    
+    assert download.clears == 2
@@ -2,6 +2,10 @@
 DEFI_LLAMA_PROTOCOLS_URL = "https://api.llama.fi/protocols"
 DEFI_LLAMA_FEES_URL = "https://api.llama.fi/overview/fees"
 
+# Caching
+CACHE_TTL_SECONDS = 3600  # Refresh API data hourly
+FALLBACK_TTL_SECONDS = 60  # Retry a failed API fetch after a minute
+
 # Scoring Model Weights (Global Constants)
 VALUATION_GAP_WEIGHT = 0.40   # How undervalued compared to sector median
 REVENUE_TREND_WEIGHT = 0.30   # Revenue momentum (1d vs 7d average)
@@ -1,90 +1,178 @@
+import threading
+import time
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+import numpy as np
 import pandas as pd
 import streamlit as st
-from utils.consts import DEFI_LLAMA_PROTOCOLS_URL, DEFI_LLAMA_FEES_URL
+from utils.consts import DEFI_LLAMA_PROTOCOLS_URL, DEFI_LLAMA_FEES_URL, CACHE_TTL_SECONDS, FALLBACK_TTL_SECONDS
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
-def fetch_protocols_data() -> pd.DataFrame:
+# Shared HTTP session: both endpoints live on api.llama.fi, so keep-alive lets
+# the second fetch reuse the TLS connection opened by the first.
+_SESSION = requests.Session()
+_SESSION.headers.update({'Accept-Encoding': 'gzip'})
+_SESSION.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=4))
+
+
+def current_cache_window() -> int:
+    """
+    Return the index of the current cache refresh window.
+    
+    Disk-persisted Streamlit caches ignore ``ttl``, so cached loaders take this
+    value as an argument instead: a new window changes the cache key and forces
+    a fresh download, while reruns and restarts within a window hit disk.
+    """
+    return int(time.time() // CACHE_TTL_SECONDS)
+
+
+# Last refresh window each disk-cached download was called with (see below)
+_DOWNLOAD_WINDOWS = {}
+_DOWNLOAD_WINDOWS_LOCK = threading.Lock()
+
+
+def _drop_stale_downloads(download, cache_window: int) -> None:
+    """
+    Clear ``download``'s cache when the refresh window moves on.
+    
+    Streamlit never deletes disk entries for old keys (``max_entries`` only
+    evicts the in-memory copy), so without this every window would leave a
+    full-response pickle behind in the disk cache.
+    """
+    with _DOWNLOAD_WINDOWS_LOCK:
+        last_window = _DOWNLOAD_WINDOWS.setdefault(download.__name__, cache_window)
+        if last_window != cache_window:
+            download.clear()
+            _DOWNLOAD_WINDOWS[download.__name__] = cache_window
+
+
+def _compact_protocols(df: pd.DataFrame) -> pd.DataFrame:
+    """Downcast protocol columns: float32 for money values, categorical for labels."""
+    return df.astype({
+        'tvl': 'float32',
+        'mcap': 'float32',
+        'category': 'category',
+        'primary_chain': 'category',
+    })
+
+
+def _compact_fees(df: pd.DataFrame) -> pd.DataFrame:
+    """Downcast fee columns to float32."""
+    return df.astype({'total24h': 'float32', 'total7d': 'float32', 'total30d': 'float32'})
+
+
+@st.cache_data(persist="disk", max_entries=2, show_spinner=False)
+def _download_protocols_data(cache_window: int) -> pd.DataFrame:
+    """
+    Download protocol data from DefiLlama API.
+    
+    Raises on any failure so that errors are never persisted to the disk cache.
+    """
+    response = _SESSION.get(DEFI_LLAMA_PROTOCOLS_URL, timeout=30)
+    response.raise_for_status()
+    data = orjson.loads(response.content)
+    
+    df = pd.DataFrame(data)
+    
+    # Extract relevant columns
+    cols = ['name', 'symbol', 'tvl', 'mcap', 'category', 'chains']
+    # Handle missing columns safely
+    for c in cols:
+        if c not in df.columns:
+            df[c] = None
+    
+    df = df[cols].copy()
+    
+    # Clean data
+    num_cols = ['tvl', 'mcap']
+    df[num_cols] = df[num_cols].apply(pd.to_numeric, errors='coerce').fillna(0)
+    
+    # Extract primary chain (first in list)
+    df['primary_chain'] = [
+        c[0] if isinstance(c, list) and c else 'Unknown'
+        for c in df['chains'].to_numpy()
+    ]
+    
+    return _compact_protocols(df)
+
+
+@st.cache_data(persist="disk", max_entries=2, show_spinner=False)
+def _download_fees_data(cache_window: int) -> pd.DataFrame:
+    """
+    Download fee/revenue data from DefiLlama API.
+    
+    Raises on any failure so that errors are never persisted to the disk cache.
+    """
+    response = _SESSION.get(DEFI_LLAMA_FEES_URL, timeout=30)
+    response.raise_for_status()
+    data = orjson.loads(response.content)
+    
+    if 'protocols' not in data:
+        raise ValueError("No protocols in fees response")
+    
+    protocols = data['protocols']
+    
+    # Project straight to the needed columns; missing keys become NaN
+    df = pd.DataFrame(
+        protocols, columns=['name', 'symbol', 'total24h', 'total7d', 'total30d']
+    )
+    
+    # Clean data
+    num_cols = ['total24h', 'total7d', 'total30d']
+    df[num_cols] = df[num_cols].apply(pd.to_numeric, errors='coerce').fillna(0)
+    
+    return _compact_fees(df)
+
+
+@st.cache_data(ttl=FALLBACK_TTL_SECONDS, show_spinner=False)
+def fetch_protocols_data(cache_window: int) -> pd.DataFrame:
     """
-    Fetch protocol data from DefiLlama API.
+    Fetch protocol data from DefiLlama API, falling back to sample data.
+    
+    A failed download is cached for ``FALLBACK_TTL_SECONDS`` only, so a flurry
+    of reruns does not hammer the API while it is down. Sample data is flagged
+    via ``df.attrs['fallback']`` (the error message), see ``is_fallback``.
+    
+    Args:
+        cache_window: Refresh window from ``current_cache_window()``
     
     Returns:
         DataFrame with columns: name, symbol, tvl, mcap, category, chains
     """
+    _drop_stale_downloads(_download_protocols_data, cache_window)
     try:
-        response = requests.get(DEFI_LLAMA_PROTOCOLS_URL, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-        
-        df = pd.DataFrame(data)
-        
-        # Extract relevant columns
-        cols = ['name', 'symbol', 'tvl', 'mcap', 'category', 'chains']
-        # Handle missing columns safely
-        for c in cols:
-            if c not in df.columns:
-                df[c] = None
-        
-        df = df[cols].copy()
-        
-        # Clean data
-        df['tvl'] = pd.to_numeric(df['tvl'], errors='coerce').fillna(0)
-        df['mcap'] = pd.to_numeric(df['mcap'], errors='coerce').fillna(0)
-        
-        # Extract primary chain (first in list)
-        df['primary_chain'] = df['chains'].apply(
-            lambda x: x[0] if isinstance(x, list) and len(x) > 0 else 'Unknown'
-        )
-        
-        return df
-        
+        return _download_protocols_data(cache_window)
     except Exception as e:
-        st.warning(f"⚠️ Failed to fetch protocol data: {e} - we are using ramdom generated data")
-        return get_sample_protocols_data()
+        df = get_sample_protocols_data()
+        df.attrs['fallback'] = str(e)
+        return df
 
 
-@st.cache_data(ttl=3600)
-def fetch_fees_data() -> pd.DataFrame:
+@st.cache_data(ttl=FALLBACK_TTL_SECONDS, show_spinner=False)
+def fetch_fees_data(cache_window: int) -> pd.DataFrame:
     """
-    Fetch fee/revenue data from DefiLlama API.
+    Fetch fee/revenue data from DefiLlama API, falling back to sample data.
+    
+    Failures are cached briefly, as in ``fetch_protocols_data``.
+    
+    Args:
+        cache_window: Refresh window from ``current_cache_window()``
     
     Returns:
         DataFrame with columns: name, symbol, total24h, total7d, total30d
     """
+    _drop_stale_downloads(_download_fees_data, cache_window)
     try:
-        response = requests.get(DEFI_LLAMA_FEES_URL, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-        
-        if 'protocols' not in data:
-            raise ValueError("No protocols in fees response")
-        
-        protocols = data['protocols']
-        
-        rows = []
-        for protocol in protocols:
-            rows.append({
-                'name': protocol.get('name', ''),
-                'symbol': protocol.get('symbol', ''),
-                'total24h': protocol.get('total24h', 0),
-                'total7d': protocol.get('total7d', 0),
-                'total30d': protocol.get('total30d', 0),
-            })
-        
-        df = pd.DataFrame(rows)
-        
-        # Clean data
-        for col in ['total24h', 'total7d', 'total30d']:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-        
-        return df
-        
+        return _download_fees_data(cache_window)
     except Exception as e:
-        # st.warning(f"⚠️ Failed to fetch fees data: {e}. Using sample data.")
-        # Only warn once in the main protocols fetch if both fail, or just warn here too
-        # The user requested "if the api dosent work write a message that we are using ramdom generated data"
-        # We can rely on the first warning or print it here too.
-        return get_sample_fees_data()
+        df = get_sample_fees_data()
+        df.attrs['fallback'] = str(e)
+        return df
+
+
+def is_fallback(df: pd.DataFrame) -> bool:
+    """Return True if ``df`` holds generated sample data rather than API data."""
+    return 'fallback' in df.attrs
 
 
 def get_sample_protocols_data() -> pd.DataFrame:
@@ -114,7 +202,7 @@ def get_sample_protocols_data() -> pd.DataFrame:
             'primary_chain': chain
         })
         
-    return pd.DataFrame(data)
+    return _compact_protocols(pd.DataFrame(data))
 
 
 def get_sample_fees_data() -> pd.DataFrame:
@@ -135,80 +223,72 @@ def get_sample_fees_data() -> pd.DataFrame:
             'total30d': daily_rev * 30 * random.uniform(0.8, 1.2)
         })
         
-    return pd.DataFrame(data)
+    return _compact_fees(pd.DataFrame(data))
+
+
+def _normalize_keys(values: pd.Series) -> np.ndarray:
+    """Lowercase and strip join keys in a single pass; non-strings become None."""
+    return np.array(
+        [v.lower().strip() if isinstance(v, str) else None for v in values.to_numpy()],
+        dtype=object
+    )
+
+
+def _first_match(keys: np.ndarray, lookup_keys: np.ndarray, lookup_values: pd.DataFrame) -> np.ndarray:
+    """
+    Left-join helper: for each entry of ``keys``, return the row of
+    ``lookup_values`` at the first matching ``lookup_keys`` entry (NaN if none).
+    
+    Both key columns are factorized into one shared integer space, so the
+    deduplication and the join run on int codes instead of hashing strings twice.
+    """
+    codes, uniques = pd.factorize(np.concatenate([keys, lookup_keys]))
+    key_codes, lookup_codes = codes[:len(keys)], codes[len(keys):]
+    
+    # Row of the first occurrence of each code; NaN keys factorize to -1 and never match
+    is_first = ~pd.Series(lookup_codes).duplicated().to_numpy() & (lookup_codes >= 0)
+    first_row = np.full(len(uniques), -1)
+    first_row[lookup_codes[is_first]] = np.flatnonzero(is_first)
+    
+    # Look up only valid keys: -1 codes must never index first_row (it is
+    # empty when neither side has a single usable key)
+    matched_row = np.full(len(keys), -1)
+    valid = key_codes >= 0
+    matched_row[valid] = first_row[key_codes[valid]]
+    hit = matched_row >= 0
+    
+    values = lookup_values.to_numpy()
+    # Always a float buffer so unmatched rows can hold NaN (integer fee columns
+    # would otherwise wrap NaN to INT64_MIN); float32 inputs stay float32
+    out = np.full((len(keys), values.shape[1]), np.nan, dtype=np.result_type(values.dtype, np.float32))
+    out[hit] = values[matched_row[hit]]
+    return out
 
 
 def merge_datasets(protocols_df: pd.DataFrame, fees_df: pd.DataFrame) -> pd.DataFrame:
     """
     Merge protocol data with fees data.
     """
-    # Create copies to avoid modifying originals
-    protocols = protocols_df.copy()
-    fees = fees_df.copy()
+    fee_cols = ['total24h', 'total7d', 'total30d']
+    fee_values = fees_df[fee_cols]
     
-    # Standardize for matching
-    protocols['name_lower'] = protocols['name'].str.lower().str.strip()
-    fees['name_lower'] = fees['name'].str.lower().str.strip()
+    # Standardize for matching (standalone arrays, so inputs are not mutated)
+    name_lower = _normalize_keys(protocols_df['name'])
+    fees_name_lower = _normalize_keys(fees_df['name'])
     
-    # Deduplicate fees data on name_lower (keep first occurrence)
-    fees_dedup = fees.drop_duplicates(subset='name_lower', keep='first')
-    
-    # Merge on name
-    merged = protocols.merge(
-        fees_dedup[['name_lower', 'total24h', 'total7d', 'total30d']],
-        on='name_lower',
-        how='left'
-    )
+    # Match on name (first fees row wins for duplicated names)
+    matched = _first_match(name_lower, fees_name_lower, fee_values)
     
     # For still unmatched rows, try symbol matching
-    unmatched_mask = merged['total24h'].isna()
-    if unmatched_mask.any():
-        # Prepare symbol-based matching
-        # Must check if 'symbol' exists
-        if 'symbol' in protocols.columns:
-            protocols['symbol_lower'] = protocols['symbol'].str.lower().str.strip()
-            
-            # Since we merged protocols, merged already has protocol symbols. 
-            # We need to look up into FEES by symbol.
-            
-            fees['symbol_lower'] = fees['symbol'].str.lower().str.strip()
-            fees_symbol_dedup = fees.drop_duplicates(subset='symbol_lower', keep='first')
-            
-            # Get unmatched protocol indices
-            unmatched_indices = merged[unmatched_mask].index.tolist()
-            
-            for idx in unmatched_indices:
-                # Get the symbol from the protocols DF (using the index which is preserved/aligned if left merge?
-                # Wait, merge resets index if not careful.
-                # Left merge on Protocols preserves Protocols index if 1-to-1?
-                # Actually, `merge` returns new DF with integers usually.
-                # But here we are iterating over `merged` indices.
-                
-                # Check protocols original
-                # This logic is a bit tricky if `merged` indices don't align with `protocols` indices.
-                # 'protocols' and 'merged' should have same length and order if 'how=left' and 'fees_dedup' is unique on join key.
-                # 'fees_dedup' IS unique (we dropped duplicates).
-                # So indices should align.
-                
-                # Let's use loc from merged directly if symbol is reachable?
-                # merged has 'symbol' column from protocols.
-                
-                symbol_val = merged.loc[idx, 'symbol']
-                if pd.notna(symbol_val):
-                    symbol_lower = str(symbol_val).lower().strip()
-                    match = fees_symbol_dedup[fees_symbol_dedup['symbol_lower'] == symbol_lower]
-                    if not match.empty:
-                        merged.loc[idx, 'total24h'] = match.iloc[0]['total24h']
-                        merged.loc[idx, 'total7d'] = match.iloc[0]['total7d']
-                        merged.loc[idx, 'total30d'] = match.iloc[0]['total30d']
+    unmatched_mask = np.isnan(matched[:, 0])
+    if unmatched_mask.any() and 'symbol' in protocols_df.columns:
+        symbol_lower = _normalize_keys(protocols_df['symbol'])
+        fees_symbol_lower = _normalize_keys(fees_df['symbol'])
+        
+        by_symbol = _first_match(symbol_lower, fees_symbol_lower, fee_values)
+        matched[unmatched_mask] = by_symbol[unmatched_mask]
     
     # Fill remaining NaN with 0
-    for col in ['total24h', 'total7d', 'total30d']:
-        merged[col] = merged[col].fillna(0)
-    
-    # Clean up temporary columns (drop only if they exist)
-    cols_to_drop = ['name_lower', 'symbol_lower']
-    existing_drop = [c for c in cols_to_drop if c in merged.columns]
-    merged = merged.drop(columns=existing_drop)
+    matched[np.isnan(matched)] = 0
     
-    return merged
+    return protocols_df.assign(**{col: matched[:, i] for i, col in enumerate(fee_cols)})
@@ -2,47 +2,73 @@ import pandas as pd
 import numpy as np
 from utils.consts import VALUATION_GAP_WEIGHT, REVENUE_TREND_WEIGHT, SIZE_EFFICIENCY_WEIGHT
 
-def calculate_financial_metrics(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Calculate key financial metrics for valuation analysis.
-    """
-    df = df.copy()
+def _annualized_revenue_and_ps(df: pd.DataFrame):
+    """Return (annualized_revenue, ps_ratio) arrays for ``df``."""
+    total30d = df['total30d'].to_numpy(dtype=float)
+    total24h = df['total24h'].to_numpy(dtype=float)
+    mcap = df['mcap'].to_numpy(dtype=float)
     
     # Calculate Annualized Revenue
     # Priority: 30d * 12, fallback to 24h * 365
-    df['annualized_revenue'] = np.where(
-        df['total30d'] > 0,
-        df['total30d'] * 12,  # 30 days of data, annualize
-        df['total24h'] * 365  # Use daily revenue, 365 days
+    annualized_revenue = np.where(
+        total30d > 0,
+        total30d * 12,  # 30 days of data, annualize
+        total24h * 365  # Use daily revenue, 365 days
     )
     
     # Calculate P/S Ratio
-    # Guard against division by zero
-    df['ps_ratio'] = np.where(
-        df['annualized_revenue'] > 0,
-        df['mcap'] / df['annualized_revenue'],
-        np.inf  # Infinite P/S when no revenue
+    # Guard against division by zero: only divide where there is revenue,
+    # infinite P/S elsewhere (no temporary for the unused branch)
+    ps_ratio = np.divide(
+        mcap, annualized_revenue,
+        out=np.full(len(df), np.inf),
+        where=annualized_revenue > 0
     )
+    return annualized_revenue, ps_ratio
+
+
+def calculate_sector_median_ps(df: pd.DataFrame) -> float:
+    """
+    Calculate the Sector Median P/S over the whole protocol population.
+    
+    Computed once on the unfiltered frame so that filtering the view does not
+    move the valuation benchmark.
+    """
+    _, ps = _annualized_revenue_and_ps(df)
     
-    # Replace infinity with a very high number for calculations
-    df['ps_ratio_calc'] = df['ps_ratio'].replace([np.inf, -np.inf], np.nan)
+    # Exclude infinite / non-positive / outlier values
+    valid_ps = np.isfinite(ps) & (ps > 0) & (ps < 1000)
+    return float(np.median(ps[valid_ps])) if valid_ps.any() else 10.0
+
+
+def calculate_financial_metrics(df: pd.DataFrame, sector_median_ps: float) -> pd.DataFrame:
+    """
+    Calculate key financial metrics for valuation analysis.
     
-    # Calculate Sector Median P/S (excluding infinite values)
-    valid_ps = df[df['ps_ratio_calc'].notna() & (df['ps_ratio_calc'] > 0) & (df['ps_ratio_calc'] < 1000)]
-    sector_median_ps = valid_ps['ps_ratio_calc'].median() if len(valid_ps) > 0 else 10.0
+    Columns are added to ``df`` in place (no defensive copy); pass a frame the
+    caller owns. ``sector_median_ps`` comes from ``calculate_sector_median_ps``.
+    """
+    # Work on raw arrays so each expression is a single ufunc pass
+    mcap = df['mcap'].to_numpy(dtype=float)
+    annualized_revenue, ps_ratio = _annualized_revenue_and_ps(df)
+    df['annualized_revenue'] = annualized_revenue
+    df['ps_ratio'] = ps_ratio  # inf when there is no revenue
     
-    # Store sector median for display
-    df['sector_median_ps'] = sector_median_ps
+    # Store sector median for display (frame-level scalar, survives filtering)
+    df.attrs['sector_median_ps'] = sector_median_ps
     
     # Calculate Fair Value
-    df['fair_value'] = df['annualized_revenue'] * sector_median_ps
+    fair_value = annualized_revenue * sector_median_ps
+    df['fair_value'] = fair_value
     
     # Calculate Upside Potential (%)
-    df['upside_potential'] = np.where(
-        df['mcap'] > 0,
-        ((df['fair_value'] - df['mcap']) / df['mcap']) * 100,
-        0
+    upside_potential = np.divide(
+        fair_value - mcap, mcap,
+        out=np.zeros(len(df)),
+        where=mcap > 0
     )
+    upside_potential *= 100
+    df['upside_potential'] = upside_potential
     
     return df
 
@@ -50,57 +76,77 @@ def calculate_financial_metrics(df: pd.DataFrame) -> pd.DataFrame:
 def calculate_venture_score(df: pd.DataFrame) -> pd.DataFrame:
     """
     Calculate the Venture Score (0-100) based on three components.
+    
+    Like ``calculate_financial_metrics``, this writes its columns into ``df``
+    in place and returns the same frame.
     """
-    df = df.copy()
+    # Pull each input column once; every component below is plain ndarray
+    # arithmetic, so no intermediate Series are built along the way
+    upside_potential = df['upside_potential'].to_numpy(dtype=float)
+    total24h = df['total24h'].to_numpy(dtype=float)
+    total7d = df['total7d'].to_numpy(dtype=float)
+    tvl = df['tvl'].to_numpy(dtype=float)
+    mcap = df['mcap'].to_numpy(dtype=float)
     
     # 1. Valuation Gap Score
     # Cap upside at 200% and floor at -100% for scoring
-    upside_capped = df['upside_potential'].clip(-100, 200)
+    # (clipped into the output buffer, then normalized in place)
+    valuation_score = np.clip(upside_potential, -100, 200)
     # Normalize: -100 -> 0, 200 -> weight * 100
-    df['valuation_score'] = ((upside_capped + 100) / 300) * (VALUATION_GAP_WEIGHT * 100)
+    valuation_score += 100
+    valuation_score /= 300
+    valuation_score *= VALUATION_GAP_WEIGHT * 100
+    df['valuation_score'] = valuation_score
     
     # 2. Revenue Trend Score
     # Calculate 7d daily average
-    df['daily_avg_7d'] = df['total7d'] / 7
+    daily_avg_7d = total7d / 7
+    df['daily_avg_7d'] = daily_avg_7d
     
     # Revenue trend: (current daily - 7d avg) / 7d avg
-    df['revenue_trend'] = np.where(
-        df['daily_avg_7d'] > 0,
-        ((df['total24h'] - df['daily_avg_7d']) / df['daily_avg_7d']) * 100,
-        0  # No trend data available
+    # No trend data available -> 0
+    revenue_trend = np.divide(
+        total24h - daily_avg_7d, daily_avg_7d,
+        out=np.zeros(len(df)),
+        where=daily_avg_7d > 0
     )
+    revenue_trend *= 100
+    df['revenue_trend'] = revenue_trend
     
     # Flag for insufficient data
     df['revenue_trend_status'] = np.where(
-        df['total7d'] > 0,
+        total7d > 0,
         'Calculated',
         'Insufficient Data'
     )
     
     # Normalize: -50% to +50% trend -> 0 to weight * 100
-    trend_capped = df['revenue_trend'].clip(-50, 50)
-    df['trend_score'] = ((trend_capped + 50) / 100) * (REVENUE_TREND_WEIGHT * 100)
+    trend_score = np.clip(revenue_trend, -50, 50)
+    trend_score += 50
+    trend_score /= 100
+    trend_score *= REVENUE_TREND_WEIGHT * 100
+    df['trend_score'] = trend_score
     
     # 3. Size/Efficiency Score
     # TVL / Market Cap ratio
-    df['tvl_mcap_ratio'] = np.where(
-        df['mcap'] > 0,
-        df['tvl'] / df['mcap'],
-        0
+    tvl_mcap_ratio = np.divide(
+        tvl, mcap,
+        out=np.zeros(len(df)),
+        where=mcap > 0
     )
+    df['tvl_mcap_ratio'] = tvl_mcap_ratio
     
     # Normalize: 0-10 ratio -> 0 to weight * 100 (cap at 10x)
-    ratio_capped = df['tvl_mcap_ratio'].clip(0, 10)
-    df['efficiency_score'] = (ratio_capped / 10) * (SIZE_EFFICIENCY_WEIGHT * 100)
-    
-    # Calculate Final Venture Score
-    df['venture_score'] = (
-        df['valuation_score'] + 
-        df['trend_score'] + 
-        df['efficiency_score']
-    ).round(1)
-    
-    # Cap at 0-100
-    df['venture_score'] = df['venture_score'].clip(0, 100)
+    efficiency_score = np.clip(tvl_mcap_ratio, 0, 10)
+    efficiency_score /= 10
+    efficiency_score *= SIZE_EFFICIENCY_WEIGHT * 100
+    df['efficiency_score'] = efficiency_score
+    
+    # Calculate Final Venture Score, capped at 0-100
+    venture_score = valuation_score + trend_score
+    venture_score += efficiency_score
+    np.round(venture_score, 1, out=venture_score)
+    np.clip(venture_score, 0, 100, out=venture_score)
+    df['venture_score'] = venture_score
     
     return df
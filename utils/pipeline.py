@@ -0,0 +1,53 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from utils.data import fetch_protocols_data, fetch_fees_data, merge_datasets
+from utils.metrics import calculate_sector_median_ps, calculate_financial_metrics, calculate_venture_score
+
+def fetch_all_data(cache_window: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Fetch protocols and fees data concurrently.
+    
+    Args:
+        cache_window: Refresh window from ``current_cache_window()``
+    
+    Returns:
+        Tuple of (protocols_df, fees_df)
+    """
+    # The two endpoints are independent and I/O-bound, so fetch them concurrently.
+    # Workers inherit the script context so cached calls run as part of this session.
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(max_workers=2, initializer=add_script_run_ctx, initargs=(None, ctx)) as ex:
+        protocols_future = ex.submit(fetch_protocols_data, cache_window)
+        fees_future = ex.submit(fetch_fees_data, cache_window)
+        return protocols_future.result(), fees_future.result()
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def load_merged_protocols(
+    cache_window: int,
+    fallback: Tuple[bool, bool],
+    _protocols_df: pd.DataFrame,
+    _fees_df: pd.DataFrame,
+) -> pd.DataFrame:
+    """Merge protocol and fees data; store sector_median_ps and tvl_max in ``attrs``."""
+    merged_df = merge_datasets(_protocols_df, _fees_df)
+    merged_df.attrs['sector_median_ps'] = calculate_sector_median_ps(merged_df)
+    merged_df.attrs['tvl_max'] = float(merged_df['tvl'].max())
+    return merged_df
+
+
+def score_protocols(df: pd.DataFrame) -> pd.DataFrame:
+    """Calculate per-row metrics and the Venture Score for an already filtered frame."""
+    # Shallow copy: new columns go on our own frame object without copying the data
+    df = df.copy(deep=False)
+    df = calculate_financial_metrics(df, df.attrs['sector_median_ps'])
+    df = calculate_venture_score(df)
+    
+    # Metrics are computed in float64, but the dashboard only shows ~1 decimal;
+    # float32 halves what every renderer reads and serializes to the browser
+    float_cols = df.select_dtypes('float64').columns
+    df[float_cols] = df[float_cols].astype('float32')
+    return df
@@ -1,9 +1,89 @@
+import math
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 from typing import Tuple
 from utils.consts import CATEGORY_DESCRIPTIONS
 
+# Custom CSS for professional dark theme styling
+_PAGE_CSS = """
+    <style>
+    /* Main container styling */
+    .main {
+        background-color: #0e1117;
+    }
+    
+    /* KPI Card styling */
+    .kpi-row {
+        display: flex;
+        gap: 16px;
+    }
+    
+    .kpi-card {
+        flex: 1;
+        background: linear-gradient(135deg, #1a1f2e 0%, #2d3548 100%);
+        border-radius: 12px;
+        padding: 20px;
+        border: 1px solid #3d4f6f;
+        text-align: center;
+        box-shadow: 0 4px 15px rgba(0, 0, 0, 0.3);
+    }
+    
+    .kpi-value {
+        font-size: 2.2rem;
+        font-weight: bold;
+        color: #00d4ff;
+        margin: 10px 0;
+    }
+    
+    .kpi-label {
+        font-size: 0.9rem;
+        color: #8b9dc3;
+        text-transform: uppercase;
+        letter-spacing: 1px;
+    }
+    
+    /* Header styling */
+    .main-header {
+        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+        font-size: 2.5rem;
+        font-weight: 800;
+        text-align: center;
+        margin-bottom: 10px;
+    }
+    
+    .sub-header {
+        color: #8b9dc3;
+        text-align: center;
+        font-size: 1.1rem;
+        margin-bottom: 30px;
+    }
+    </style>
+"""
+
+# Whitespace-collapsed once at import; this is what goes over the wire each run
+_PAGE_CSS_HTML = " ".join(_PAGE_CSS.split())
+
+# One KPI card (classes styled in _PAGE_CSS); kept on a single line so the
+# joined row stays one markdown HTML block
+_KPI_TMPL = '<div class="kpi-card"><div class="kpi-label">{label}</div><div class="kpi-value"{style}>{value}</div></div>'
+
+
+def _category_label(cat: str, desc: str) -> str:
+    """Turn "Dexs" + "Decentralized Exchanges - ..." into "Dexs (Decentralized Exchanges)"."""
+    full_name = desc.split(" - ")[0]
+    if full_name.lower() != cat.lower():
+        return f"{cat} ({full_name})"
+    return cat
+
+
+# Multiselect labels, built once so format_func is a single dict lookup per option
+_CATEGORY_LABELS = {cat: _category_label(cat, desc) for cat, desc in CATEGORY_DESCRIPTIONS.items() if desc}
+
+
 def setup_page_config():
     """Configure Streamlit page settings for professional appearance."""
     st.set_page_config(
@@ -13,57 +93,9 @@ def setup_page_config():
         initial_sidebar_state="expanded"
     )
     
-    # Custom CSS for professional dark theme styling
-    st.markdown("""
-        <style>
-        /* Main container styling */
-        .main {
-            background-color: #0e1117;
-        }
-        
-        /* KPI Card styling */
-        .kpi-card {
-            background: linear-gradient(135deg, #1a1f2e 0%, #2d3548 100%);
-            border-radius: 12px;
-            padding: 20px;
-            border: 1px solid #3d4f6f;
-            text-align: center;
-            box-shadow: 0 4px 15px rgba(0, 0, 0, 0.3);
-        }
-        
-        .kpi-value {
-            font-size: 2.2rem;
-            font-weight: bold;
-            color: #00d4ff;
-            margin: 10px 0;
-        }
-        
-        .kpi-label {
-            font-size: 0.9rem;
-            color: #8b9dc3;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }
-        
-        /* Header styling */
-        .main-header {
-            background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            font-size: 2.5rem;
-            font-weight: 800;
-            text-align: center;
-            margin-bottom: 10px;
-        }
-        
-        .sub-header {
-            color: #8b9dc3;
-            text-align: center;
-            font-size: 1.1rem;
-            margin-bottom: 30px;
-        }
-        </style>
-    """, unsafe_allow_html=True)
+    # Re-emitted on every run: Streamlit drops elements a rerun does not
+    # repeat, so a once-per-session guard would lose the styles
+    st.markdown(_PAGE_CSS_HTML, unsafe_allow_html=True)
 
 
 def render_header():
@@ -76,56 +108,24 @@ def render_header():
     )
 
 
-def render_sidebar_filters(df: pd.DataFrame) -> Tuple[list, list, float]:
-    """
-    Render sidebar filters and return filter values.
-    """
-    st.sidebar.header("🎯 Filter Protocols")
-    st.sidebar.markdown("---")
-    
-    # Category filter with descriptions
-    categories = sorted(df['category'].dropna().unique().tolist())
-    
-    def format_cat_label(cat):
-        desc = CATEGORY_DESCRIPTIONS.get(cat, "")
-        if desc:
-            # "Dexs - Decentralized..." -> "Dexs (Decentralized...)"
-            parts = desc.split(" - ")
-            if len(parts) > 0:
-                full_name = parts[0]
-                if full_name.lower() != cat.lower():
-                    return f"{cat} ({full_name})"
-        return cat
+# Cached helpers take their frame as an underscore argument, which
+# st.cache_data does not hash; a cheap token argument keys the entry instead.
+@st.cache_data(max_entries=4, show_spinner=False)
+def _filter_options(data_token, _df: pd.DataFrame) -> Tuple[list, list, float]:
+    """Derive the sidebar option lists (categories, chains, max TVL) once per dataset."""
+    # Both columns are categorical (see utils.data); their categories are
+    # already unique, NaN-free and sorted, so no unique/sort pass is needed
+    categories = _df['category'].cat.categories.tolist()
+    chains = _df['primary_chain'].cat.categories.tolist()
+    # Max TVL is computed once at load time (see utils.pipeline)
+    return categories, chains, _df.attrs['tvl_max']
 
-    selected_categories = st.sidebar.multiselect(
-        "📊 Categories",
-        options=categories,
-        default=[],
-        format_func=format_cat_label,
-        help="Filter by protocol category"
-    )
-    
-    # Show description for selected categories
-    if selected_categories:
-        st.sidebar.markdown("**Selected Categories:**")
-        for cat in selected_categories:
-            if cat in CATEGORY_DESCRIPTIONS:
-                st.sidebar.caption(f"• {CATEGORY_DESCRIPTIONS[cat]}")
-    
-    # Chain filter
-    chains = sorted(df['primary_chain'].dropna().unique().tolist())
-    selected_chains = st.sidebar.multiselect(
-        "⛓️ Chains",
-        options=chains,
-        default=[],
-        help="Filter by primary blockchain where the protocol is deployed"
-    )
-    
-    st.sidebar.markdown("---")
-    max_tvl = df['tvl'].max()
-    
+
+@st.fragment
+def _render_tvl_filter(max_tvl: float) -> float:
+    """Render the TVL widgets as a fragment; return the applied min TVL in $."""
     # Unit Selector
-    tvl_unit = st.sidebar.radio("💰 TVL Unit", ["Millions ($M)", "Billions ($B)"], horizontal=True)
+    tvl_unit = st.radio("💰 TVL Unit", ["Millions ($M)", "Billions ($B)"], horizontal=True)
     
     # Configure scales based on unit
     if "Billions" in tvl_unit:
@@ -164,7 +164,7 @@ def render_sidebar_filters(df: pd.DataFrame) -> Tuple[list, list, float]:
     # Ensure value is valid
     current_val = float(st.session_state.tvl_filter_value)
     
-    col_slider, col_input = st.sidebar.columns([2, 1])
+    col_slider, col_input = st.columns([2, 1])
     
     with col_slider:
         st.slider(
@@ -195,6 +195,55 @@ def render_sidebar_filters(df: pd.DataFrame) -> Tuple[list, list, float]:
     # Calculate final filter value
     min_tvl = st.session_state.tvl_filter_value * multiplier
     
+    # Slider drags, manual edits and unit switches only rerun this fragment;
+    # the page picks up a new threshold once it is applied
+    if 'tvl_filter_applied' not in st.session_state:
+        st.session_state.tvl_filter_applied = min_tvl
+    pending = not math.isclose(st.session_state.tvl_filter_applied, min_tvl)
+    if st.button("Apply TVL Filter", disabled=not pending, help="Update the dashboard with this threshold"):
+        st.session_state.tvl_filter_applied = min_tvl
+        st.rerun()
+    
+    # Return the applied value so unit round-trips keep downstream cache keys stable
+    return st.session_state.tvl_filter_applied
+
+
+def render_sidebar_filters(df: pd.DataFrame, data_token) -> Tuple[list, list, float]:
+    """Render sidebar filters and return filter values (``data_token`` keys the cached options)."""
+    st.sidebar.header("🎯 Filter Protocols")
+    st.sidebar.markdown("---")
+    
+    categories, chains, max_tvl = _filter_options(data_token, df)
+    
+    # Category filter with descriptions (labels precomputed at import)
+    selected_categories = st.sidebar.multiselect(
+        "📊 Categories",
+        options=categories,
+        default=[],
+        format_func=lambda cat: _CATEGORY_LABELS.get(cat, cat),
+        help="Filter by protocol category"
+    )
+    
+    # Show description for selected categories
+    if selected_categories:
+        st.sidebar.markdown("**Selected Categories:**")
+        for cat in selected_categories:
+            if cat in CATEGORY_DESCRIPTIONS:
+                st.sidebar.caption(f"• {CATEGORY_DESCRIPTIONS[cat]}")
+    
+    # Chain filter
+    selected_chains = st.sidebar.multiselect(
+        "⛓️ Chains",
+        options=chains,
+        default=[],
+        help="Filter by primary blockchain where the protocol is deployed"
+    )
+    
+    st.sidebar.markdown("---")
+    
+    with st.sidebar:
+        min_tvl = _render_tvl_filter(max_tvl)
+    
     st.sidebar.markdown("---")
     st.sidebar.info(
         "💡 **Tip**: Use filters strategically to find hidden gems. "
@@ -204,119 +253,74 @@ def render_sidebar_filters(df: pd.DataFrame) -> Tuple[list, list, float]:
     return selected_categories, selected_chains, min_tvl
 
 
+def get_sector_median_ps(df: pd.DataFrame) -> float:
+    """Return the population-wide sector median P/S set by ``utils.pipeline``."""
+    return df.attrs.get('sector_median_ps', 10.0)
+
+
 def apply_filters(df: pd.DataFrame, categories: list, chains: list, min_tvl: float) -> pd.DataFrame:
     """Apply sidebar filters to the dataframe."""
-    filtered = df.copy()
+    # Fuse all conditions into one boolean mask and index once (no copy needed,
+    # downstream code only adds columns to its own frame)
+    mask = df['tvl'].to_numpy() >= min_tvl
     if categories:
-        filtered = filtered[filtered['category'].isin(categories)]
+        mask &= df['category'].isin(categories).to_numpy()
     if chains:
-        filtered = filtered[filtered['primary_chain'].isin(chains)]
-    filtered = filtered[filtered['tvl'] >= min_tvl]
-    return filtered
+        mask &= df['primary_chain'].isin(chains).to_numpy()
+    return df.loc[mask]
 
 
 def render_kpi_cards(df: pd.DataFrame):
     """Render the KPI summary cards."""
-    col1, col2, col3, col4 = st.columns(4)
+    cards = []
     
     # Total Protocols
-    with col1:
-        st.markdown(f"""
-            <div class="kpi-card">
-                <div class="kpi-label">Protocols Scanned</div>
-                <div class="kpi-value">{len(df):,}</div>
-            </div>
-        """, unsafe_allow_html=True)
+    cards.append(_KPI_TMPL.format(label="Protocols Scanned", value=f"{len(df):,}", style=''))
     
     # Average Sector P/S
-    if 'sector_median_ps' in df.columns and len(df) > 0:
-        avg_ps = df['sector_median_ps'].iloc[0]
-    else:
-        valid_ps = df[(df['ps_ratio_calc'].notna()) & (df['ps_ratio_calc'] > 0) & (df['ps_ratio_calc'] < 1000)]
-        avg_ps = valid_ps['ps_ratio_calc'].median() if len(valid_ps) > 0 else 10.0
+    avg_ps = get_sector_median_ps(df)
     
-    if pd.isna(avg_ps):
-        avg_ps = 10.0
-        
-    with col2:
-        st.markdown(f"""
-            <div class="kpi-card">
-                <div class="kpi-label">Sector Median P/S</div>
-                <div class="kpi-value">{avg_ps:.1f}x</div>
-            </div>
-        """, unsafe_allow_html=True)
+    cards.append(_KPI_TMPL.format(label="Sector Median P/S", value=f"{avg_ps:.1f}x", style=''))
     
     # Total Revenue (24h)
     total_revenue = df['total24h'].sum()
-    with col3:
-        st.markdown(f"""
-            <div class="kpi-card">
-                <div class="kpi-label">24h Revenue (All)</div>
-                <div class="kpi-value">${total_revenue/1e6:.1f}M</div>
-            </div>
-        """, unsafe_allow_html=True)
+    cards.append(_KPI_TMPL.format(label="24h Revenue (All)", value=f"${total_revenue/1e6:.1f}M", style=''))
     
     # Top Undervalued Pick
-    valid_protocols = df[
-        (df['upside_potential'] > 0) & 
-        (df['annualized_revenue'] > 100000) &
-        (df['venture_score'] > 50)
-    ].sort_values('venture_score', ascending=False)
-    
-    top_pick = valid_protocols.iloc[0]['name'] if len(valid_protocols) > 0 else "N/A"
-    with col4:
-        st.markdown(f"""
-            <div class="kpi-card">
-                <div class="kpi-label">Top Undervalued Pick</div>
-                <div class="kpi-value" style="font-size: 1.4rem;">{top_pick}</div>
-            </div>
-        """, unsafe_allow_html=True)
-
-
-def render_scatter_plot(df: pd.DataFrame):
-    """Render interactive scatter plot."""
-    st.subheader("📈 Valuation Landscape: P/S Ratio vs Revenue")
-    
-    plot_df = df[
-        (df['ps_ratio_calc'].notna()) & 
-        (df['ps_ratio_calc'] > 0) & 
-        (df['ps_ratio_calc'] < 500) &
-        (df['annualized_revenue'] > 0)
-    ].copy()
-    
-    if len(plot_df) == 0:
-        total_protocols = len(df)
-        no_mcap = len(df[df['mcap'] <= 0])
-        no_revenue = len(df[df['annualized_revenue'] <= 0])
-        no_both = len(df[(df['mcap'] <= 0) & (df['annualized_revenue'] <= 0)])
-        
-        st.warning(
-            f"⚠️ **No protocols with complete valuation data to display in scatter plot.**\n\n"
-            f"Out of {total_protocols} protocol(s) in this selection:\n"
-            f"- **{no_revenue}** have no revenue/fee data from DefiLlama\n"
-            f"- **{no_mcap}** have no market cap data\n"
-            f"- **{no_both}** are missing both"
-        )
-        return
+    # Only the single best row is needed: one masked argmax, no sort
+    venture_score = df['venture_score'].to_numpy()
+    is_candidate = (
+        (df['upside_potential'].to_numpy() > 0) &
+        (df['annualized_revenue'].to_numpy() > 100000) &
+        (venture_score > 50)
+    )
+    if is_candidate.any():
+        top_pick = df['name'].iat[int(np.where(is_candidate, venture_score, -np.inf).argmax())]
+    else:
+        top_pick = "N/A"
+    cards.append(_KPI_TMPL.format(
+        label="Top Undervalued Pick", value=top_pick, style=' style="font-size: 1.4rem;"'
+    ))
     
-    # Create scatter plot
+    # One flex row (see .kpi-row in _PAGE_CSS) instead of four columns, so
+    # the cards go to the frontend as a single element
+    st.markdown(f'<div class="kpi-row">{"".join(cards)}</div>', unsafe_allow_html=True)
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _build_scatter_figure(view_token, _plot_df: pd.DataFrame, median_ps: float):
+    """Build the valuation scatter figure, memoized per view."""
     fig = px.scatter(
-        plot_df,
-        x='ps_ratio_calc',
+        _plot_df,
+        x='ps_ratio',
         y='annualized_revenue',
         color='category',
         size='tvl',
         size_max=50,
         hover_name='name',
-        hover_data={
-            'ps_ratio_calc': ':.1f',
-            'annualized_revenue': ':,.0f',
-            'tvl': ':,.0f',
-            'venture_score': ':.1f',
-            'category': True
-        },
+        custom_data=['tvl', 'venture_score', 'category'],
         labels={
-            'ps_ratio_calc': 'P/S Ratio',
+            'ps_ratio': 'P/S Ratio',
             'annualized_revenue': 'Annualized Revenue ($)',
             'category': 'Category',
             'tvl': 'TVL ($)',
@@ -324,6 +328,12 @@ def render_scatter_plot(df: pd.DataFrame):
         },
         color_discrete_sequence=px.colors.qualitative.Set2
     )
+    # One shared template per trace; per-point hover data stays numeric
+    fig.update_traces(hovertemplate=(
+        '<b>%{hovertext}</b><br><br>Category=%{customdata[2]}<br>P/S Ratio=%{x:.1f}<br>'
+        'Annualized Revenue ($)=%{y:,.0f}<br>TVL ($)=%{customdata[0]:,.0f}<br>'
+        'Venture Score=%{customdata[1]:.1f}<extra></extra>'
+    ))
     
     fig.update_layout(
         template='plotly_dark',
@@ -336,60 +346,105 @@ def render_scatter_plot(df: pd.DataFrame):
         height=500
     )
     
-    median_ps = df['sector_median_ps'].iloc[0] if len(df) > 0 else 10
     fig.add_vline(x=median_ps, line_dash="dash", line_color="#ffab00", annotation_text=f"Median: {median_ps:.1f}x")
     
+    return fig
+
+
+def render_scatter_plot(df: pd.DataFrame, view_token):
+    """Render interactive scatter plot (``view_token`` keys the cached figure)."""
+    st.subheader("📈 Valuation Landscape: P/S Ratio vs Revenue")
+    
+    # NaN/inf P/S fail the range checks, so no separate notna() is needed;
+    # Plotly only reads the slice, so no copy either
+    ps = df['ps_ratio'].to_numpy()
+    rev = df['annualized_revenue'].to_numpy()
+    plot_df = df.loc[(ps > 0) & (ps < 500) & (rev > 0)]
+    
+    if len(plot_df) == 0:
+        total_protocols = len(df)
+        mcap_bad = df['mcap'].to_numpy() <= 0
+        rev_bad = df['annualized_revenue'].to_numpy() <= 0
+        no_mcap = int(mcap_bad.sum())
+        no_revenue = int(rev_bad.sum())
+        no_both = int((mcap_bad & rev_bad).sum())
+        
+        st.warning(
+            f"⚠️ **No protocols with complete valuation data to display in scatter plot.**\n\n"
+            f"Out of {total_protocols} protocol(s) in this selection:\n"
+            f"- **{no_revenue}** have no revenue/fee data from DefiLlama\n"
+            f"- **{no_mcap}** have no market cap data\n"
+            f"- **{no_both}** are missing both"
+        )
+        return
+    
+    fig = _build_scatter_figure(view_token, plot_df, get_sector_median_ps(df))
     st.plotly_chart(fig, use_container_width=True)
     st.caption("💡 **Reading the Chart**: Protocols in the bottom-right may be undervalued.")
 
 
+def _top_k_sorted_asc(df: pd.DataFrame, col: str, k: int = 10) -> pd.DataFrame:
+    """Return the ``k`` rows with the largest ``col``, ordered ascending (for horizontal bars)."""
+    vals = df[col].to_numpy()
+    if len(vals) > k:
+        # O(N) partition to the top k, then sort just those k
+        idx = np.argpartition(-vals, k)[:k]
+    else:
+        idx = np.arange(len(vals))
+    idx = idx[np.argsort(vals[idx], kind='stable')]
+    return df.iloc[idx]
 
 
+@st.cache_data(max_entries=32, show_spinner=False)
+def _build_top10_figure(data_token, col: str, title: str, rows: tuple, _top_df: pd.DataFrame):
+    """Build a "Top 10 by ``col``" bar figure, memoized on the rows shown (``rows``)."""
+    fig = px.bar(
+        _top_df, 
+        y='name', 
+        x=col, 
+        orientation='h', 
+        title=title,
+        color='revenue_trend',
+        color_continuous_scale='RdYlGn',
+        color_continuous_midpoint=0,
+        range_color=[-50, 50],
+        labels={'revenue_trend': 'Revenue Trend (%)'}
+    )
+    fig.update_layout(template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)', showlegend=False, height=400)
+    return fig
 
-def render_additional_charts(df: pd.DataFrame):
-    """Render additional market insight charts."""
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _build_category_pie_figure(categories: tuple, tvl: tuple):
+    """Build the TVL-by-category pie figure, memoized on the category sums themselves."""
+    cat_tvl = pd.DataFrame({'category': categories, 'tvl': tvl})
+    fig = px.pie(cat_tvl, values='tvl', names='category', title='TVL by Category', hole=0.4)
+    fig.update_layout(template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)', height=400)
+    return fig
+
+
+def _render_top10_chart(df: pd.DataFrame, data_token, col: str, title: str):
+    """Select the top 10 rows by ``col`` and render their (memoized) bar chart."""
+    top_df = _top_k_sorted_asc(df, col)
+    fig = _build_top10_figure(data_token, col, title, tuple(top_df.index.tolist()), top_df)
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def render_additional_charts(df: pd.DataFrame, data_token):
+    """Render additional market insight charts, cached on what they display."""
     st.subheader("📊 Market Insights")
     col1, col2 = st.columns(2)
     
     with col1:
-        top_tvl = df.nlargest(10, 'tvl').sort_values('tvl', ascending=True)
-        fig_tvl = px.bar(
-            top_tvl, 
-            y='name', 
-            x='tvl', 
-            orientation='h', 
-            title='Top 10 by TVL',
-            color='revenue_trend',
-            color_continuous_scale='RdYlGn',
-            color_continuous_midpoint=0,
-            range_color=[-50, 50],
-            labels={'revenue_trend': 'Revenue Trend (%)'}
-        )
-        fig_tvl.update_layout(template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)', showlegend=False, height=400)
-        st.plotly_chart(fig_tvl, use_container_width=True)
+        _render_top10_chart(df, data_token, 'tvl', 'Top 10 by TVL')
         
     with col2:
-        top_rev = df.nlargest(10, 'annualized_revenue').sort_values('annualized_revenue', ascending=True)
-        fig_rev = px.bar(
-            top_rev, 
-            y='name', 
-            x='annualized_revenue', 
-            orientation='h', 
-            title='Top 10 by Revenue',
-            color='revenue_trend',
-            color_continuous_scale='RdYlGn',
-            color_continuous_midpoint=0,
-            range_color=[-50, 50],
-            labels={'revenue_trend': 'Revenue Trend (%)'}
-        )
-        fig_rev.update_layout(template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)', showlegend=False, height=400)
-        st.plotly_chart(fig_rev, use_container_width=True)
+        _render_top10_chart(df, data_token, 'annualized_revenue', 'Top 10 by Revenue')
 
     # Category Distribution
     st.subheader("🥧 Market Composition")
-    cat_tvl = df.groupby('category')['tvl'].sum().reset_index()
-    fig_pie = px.pie(cat_tvl, values='tvl', names='category', title='TVL by Category', hole=0.4)
-    fig_pie.update_layout(template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)', height=400)
+    cat_tvl = df.groupby('category', observed=True)['tvl'].sum()
+    fig_pie = _build_category_pie_figure(tuple(cat_tvl.index.tolist()), tuple(cat_tvl.tolist()))
     st.plotly_chart(fig_pie, use_container_width=True)
 
 
@@ -397,19 +452,34 @@ def render_data_table(df: pd.DataFrame):
     """Render the sortable data table with key metrics."""
     st.subheader("📋 Protocol Valuation Table")
     
-    display_cols = [
-        'name', 'category', 'primary_chain', 'tvl', 'mcap',
-        'annualized_revenue', 'ps_ratio_calc', 'sector_median_ps',
-        'fair_value', 'upside_potential', 'venture_score'
-    ]
+    top_n = st.number_input(
+        "Rows to show", min_value=25, max_value=1000, value=100, step=25,
+        help="Highest Venture Scores first; only these rows are sent to the browser"
+    )
+    
+    # Source column -> table header, in display order
+    display_cols = {
+        'name': 'Protocol', 'category': 'Category', 'primary_chain': 'Chain',
+        'tvl': 'TVL ($)', 'mcap': 'Market Cap ($)',
+        'annualized_revenue': 'Annual Revenue ($)', 'ps_ratio': 'P/S Ratio',
+        'sector_median_ps': 'Sector P/S', 'fair_value': 'Fair Value ($)',
+        'upside_potential': 'Upside (%)', 'venture_score': 'Venture Score'
+    }
     
-    display_df = df[display_cols].copy()
-    display_df.columns = [
-        'Protocol', 'Category', 'Chain', 'TVL ($)', 'Market Cap ($)',
-        'Annual Revenue ($)', 'P/S Ratio', 'Sector P/S', 
-        'Fair Value ($)', 'Upside (%)', 'Venture Score'
-    ]
-    display_df = display_df.sort_values('Venture Score', ascending=False)
+    # Partial selection of the top rows (already ordered by score, descending)
+    # instead of sorting and shipping the whole filtered frame
+    top_df = df.nlargest(int(top_n), 'venture_score')
+    
+    # Project and relabel in one step; rename hands back a new frame, so no
+    # explicit copy is needed before the edits below
+    display_df = top_df[[c for c in display_cols if c != 'sector_median_ps']].rename(columns=display_cols)
+    # Sector median is a frame-level scalar; broadcast it only for the table
+    display_df.insert(
+        list(display_cols).index('sector_median_ps'), 'Sector P/S',
+        get_sector_median_ps(df)
+    )
+    # No-revenue protocols have infinite P/S; show them as blank cells
+    display_df['P/S Ratio'] = display_df['P/S Ratio'].where(display_df['P/S Ratio'] != float('inf'))
     
     st.dataframe(
         display_df,
@@ -422,6 +492,8 @@ def render_data_table(df: pd.DataFrame):
         use_container_width=True,
         height=400
     )
+    if len(df) > len(top_df):
+        st.caption(f"Showing the top {len(top_df):,} of {len(df):,} protocols by Venture Score.")
 
 
 def render_metric_explanations():